@@ -1,15 +1,146 @@
 import os
+import io
 import re
 import csv
 import json
 import argparse
 from typing import List
 import logging
-import requests
+import asyncio
+import aiohttp
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
 
 USAGE = "%(prog)s -i <input> -o <output>"
 DESCRIPTION = "Webscrap Shopify stores"
 
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; shopify-scrapper/1.0)",
+    "Accept-Encoding": "gzip, deflate"
+}
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+# Max number of domains scraped concurrently; per-host traffic stays
+# bounded by the connector's limit_per_host
+CONCURRENCY = 100
+
+# Read at most this much of a page; contact info sits well within the
+# first 512KB and regex cost is linear in body size
+MAX_PAGE_SIZE = 512 * 1024
+
+# Retry transient failures (rate limiting, upstream hiccups) with
+# exponential backoff before giving a page up
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.2
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def compile_pattern(pattern: bytes, flags: int = 0,
+                    use_re2: bool = True) -> re.Pattern:
+    """Compile regex pattern with the fastest available engine
+
+    Prefers google-re2, whose linear-time DFA avoids backtracking on
+    large HTML pages; falls back to stdlib re when re2 is missing or
+    the pattern uses syntax re2 does not support. Patterns are bytes so
+    pages can be scanned without decoding them to str first. Patterns
+    known to need Perl syntax should pass use_re2=False, as re2 logs
+    every rejected pattern to stderr before raising.
+
+    Parameters:
+        pattern (bytes): Regex pattern
+        flags (int): Regex flags (re.IGNORECASE supported)
+        use_re2 (bool): Whether re2 may be used for this pattern
+
+    Returns:
+        Pattern: Compiled pattern with the re API (findall, search)
+
+    """
+    if use_re2 and re2 is not None:
+        re2_pattern = pattern
+
+        if flags & re.IGNORECASE:
+            re2_pattern = b"(?i)" + re2_pattern
+
+        try:
+            return re2.compile(re2_pattern)
+        except re2.error:
+            pass
+
+    return re.compile(pattern, flags)
+
+
+# Patterns compiled once at import time; they run against every fetched
+# page, so the per-call compile-cache lookup and flag parsing add up
+# \b fences let the engine reject non-boundary positions immediately
+# instead of backtracking through the ambiguous character classes; the
+# lookahead drops image filenames (logo@2x.png) inside the engine but
+# is Perl syntax re2 rejects, so this pattern goes straight to re
+EMAIL_PATTERN = compile_pattern(
+    rb"\b([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\."
+    rb"(?!(?:jpe?g|png|gif|bmp)\b)[a-zA-Z0-9-.]+)\b",
+    re.IGNORECASE, use_re2=False)
+TWITTER_PATTERN = compile_pattern(
+    rb"(http(?:s)?:\/\/(?:www\.)?twitter\.com\/[a-zA-Z0-9_]+)", re.IGNORECASE)
+FACEBOOK_PATTERN = compile_pattern(
+    rb"(http(?:s)?:\/\/(?:www\.)?facebook\.com\/[a-zA-Z0-9_]+)", re.IGNORECASE)
+SITEMAP_LOC_PATTERN = compile_pattern(
+    rb"<loc>([^<>]*(?:about|contact)[^<>]*)<\/loc>", re.IGNORECASE)
+
+# Paths probed for contact info when the pages sitemap is unavailable
+CONTACT_PAGES = [
+    "/pages/about",
+    "/pages/about-us",
+    "/pages/contact",
+    "/pages/contact-us"
+]
+
+# Max number of sitemap-advertised about/contact pages scanned per store
+MAX_CONTACT_PAGES = 4
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create HTTP session shared by all requests
+
+    One session reuses keep-alive connections and the DNS cache across
+    every page fetch, instead of paying TCP+TLS setup per request.
+    Lookups go through the aiodns-backed AsyncResolver and cached
+    results are kept for 10 minutes, so only the first request per host
+    pays DNS latency.
+
+    Returns:
+        ClientSession: aiohttp session with a bounded connection pool
+
+    """
+    connector = aiohttp.TCPConnector(
+        limit=200,
+        limit_per_host=8,
+        resolver=aiohttp.resolver.AsyncResolver(),
+        use_dns_cache=True,
+        ttl_dns_cache=600
+    )
+
+    return aiohttp.ClientSession(connector=connector,
+                                 timeout=REQUEST_TIMEOUT,
+                                 headers=REQUEST_HEADERS)
+
 
 def init_argparse() -> argparse.ArgumentParser:
     """Parse script arguments.
@@ -43,149 +174,226 @@ def file_exists(path: str) -> bool:
     return os.path.isfile(path) and os.access(path, os.R_OK)
 
 
-def load_page(url: str) -> str:
+async def load_page(session: aiohttp.ClientSession, url: str) -> bytes:
     """Load web page content from specified URL
 
+    The body is kept as bytes; the extraction patterns are pure ASCII,
+    so scanning raw bytes skips a full-page str decode per fetch.
+    Transient failures (429/5xx statuses, network errors, timeouts) are
+    retried up to MAX_RETRIES times with exponential backoff.
+
     Parameters:
+        session (ClientSession): Shared HTTP session
         url (str): Web page url
 
     Returns:
-        str: Web page content
+        bytes: Web page content, truncated to MAX_PAGE_SIZE
 
     """
-    response = requests.get(url)
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt > 0:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
 
-    if response.status_code < 200 or response.status_code >= 300:
-        return None
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                if response.status in RETRY_STATUSES:
+                    continue
+
+                if response.status < 200 or response.status >= 300:
+                    return None
+
+                # Gzip/deflate bodies arrive decompressed; stop reading
+                # once the cap is reached instead of downloading the rest
+                chunks = []
+                size = 0
+
+                async for chunk in response.content.iter_chunked(1 << 16):
+                    chunks.append(chunk)
+                    size += len(chunk)
+
+                    if size >= MAX_PAGE_SIZE:
+                        break
+
+                return b"".join(chunks)[:MAX_PAGE_SIZE]
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            continue
 
-    return response.text
+    return None
 
 
-def extract_pattern(pattern: str, text: str) -> str:
+def extract_pattern(pattern: re.Pattern, text: bytes) -> str:
     """Extract first matching regex occurance in the text
 
     Parameters:
-        pattern (str): Regex pattern
-        text (str): Text to match pattern
+        pattern (Pattern): Compiled regex pattern
+        text (bytes): Text to match pattern
 
     Returns:
         str: First matching occurance
 
     """
-    finds = re.findall(pattern, text, re.IGNORECASE)
+    find = pattern.search(text)
 
-    if len(finds) < 1:
+    if find is None:
         return None
 
-    return finds[0]
+    return find.group(1).decode("utf-8", errors="replace")
 
 
-def extract_email(text: str) -> str:
+def extract_email(text: bytes) -> str:
     """Extract first email address occurance in the text
 
     Parameters:
-        text (str): Text to search emails
+        text (bytes): Text to search emails
 
     Returns:
         str: First found email address
 
     """
-    pattern = r"([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)"
-
-    finds = re.findall(pattern, text)
+    return extract_pattern(EMAIL_PATTERN, text)
 
-    if len(finds) < 1:
-        return None
 
-    for find in finds:
-        # Return first non-image
-        if not find.lower().endswith(("jpg", "jpeg", "png", "gif", "bmp")):
-            return find
-
-    return None
-
-
-def extract_twitter_link(text: str) -> str:
+def extract_twitter_link(text: bytes) -> str:
     """Extract first twitter link occurance in the text
 
     Parameters:
-        text (str): Text to search links
+        text (bytes): Text to search links
 
     Returns:
         str: First found twitter link
 
     """
-    pattern = r"(http(?:s)?:\/\/(?:www\.)?twitter\.com\/[a-zA-Z0-9_]+)"
+    return extract_pattern(TWITTER_PATTERN, text)
 
-    return extract_pattern(pattern, text)
 
-
-def extract_facebook_link(text: str) -> str:
+def extract_facebook_link(text: bytes) -> str:
     """Extract first facebook link occurance in the text
 
     Parameters:
-        text (str): Text to search links
+        text (bytes): Text to search links
 
     Returns:
         str: First found facebook link
 
     """
-    pattern = r"(http(?:s)?:\/\/(?:www\.)?facebook\.com\/[a-zA-Z0-9_]+)"
+    return extract_pattern(FACEBOOK_PATTERN, text)
 
-    return extract_pattern(pattern, text)
 
+def extract_contacts(text: bytes, contact: dict) -> None:
+    """Fill missing contact fields from one page
 
-def extract_product_handles(text: str, limit: int) -> List[str]:
-    """Extract first <limit> product handles
+    When selectolax is installed, one C-level DOM pass over the page's
+    anchors picks up mailto/Twitter/Facebook links; only fields that
+    pass leaves empty fall back to the whole-page regex scan.
 
     Parameters:
-        text (str): Text to search product handles
+        text (bytes): Web page content
+        contact (dict): Contact dict updated in place
 
     Returns:
-        List[str]: List of found product handles
+        None
 
     """
-    pattern = r"\/collections\/all\/products\/([a-zA-Z0-9_-]+)\""
+    if HTMLParser is not None:
+        tree = HTMLParser(text)
 
-    handles = re.findall(pattern, text)
+        selectors = {
+            "email": 'a[href^="mailto:"]',
+            "twitter": 'a[href*="twitter.com"]',
+            "facebook": 'a[href*="facebook.com"]'
+        }
+
+        patterns = {
+            "email": EMAIL_PATTERN,
+            "twitter": TWITTER_PATTERN,
+            "facebook": FACEBOOK_PATTERN
+        }
+
+        for field, selector in selectors.items():
+            if contact[field] is not None:
+                continue
+
+            for node in tree.css(selector):
+                href = node.attributes.get("href") or ""
 
-    if len(handles) < 1:
-        return []
+                # The pattern validates the href and trims mailto:
+                # prefixes and query strings off the address
+                find = extract_pattern(patterns[field], href.encode())
 
-    # Remove duplicates
-    handles = list(dict.fromkeys(handles))
+                if find is not None:
+                    contact[field] = find
+                    break
 
-    return handles[:limit]
+    if contact["email"] is None:
+        contact["email"] = extract_email(text)
 
+    if contact["twitter"] is None:
+        contact["twitter"] = extract_twitter_link(text)
 
-def parse_product(text: str) -> dict:
-    """Parse JSON product information
+    if contact["facebook"] is None:
+        contact["facebook"] = extract_facebook_link(text)
+
+
+def parse_products(text: bytes, limit: int) -> List[dict]:
+    """Parse JSON products list information
+
+    When ijson is installed the document is parsed as a stream that
+    stops after <limit> products, so the rest of a large listing is
+    never materialized; otherwise the whole document is parsed with
+    orjson (or stdlib json) and truncated.
 
     Parameters:
-        text (str): JSON text with product info
+        text (bytes): JSON text with products list
+        limit (int): Max number of returned products
 
     Returns:
-        dict: Dictionary containing product title and featured image URL
+        List[dict]: Dicts containing product title and featured image URL
 
     """
-    product = {
-        "title": None,
-        "image": None
-    }
+    products = []
+
+    if ijson is not None:
+        try:
+            infos = ijson.items(io.BytesIO(text), "products.item")
+
+            for info in infos:
+                products.append(_product_fields(info))
+
+                if len(products) >= limit:
+                    break
+        except ijson.JSONError as ex:
+            raise ValueError(f"Invalid products JSON: {ex}") from ex
 
-    data = json.loads(text)
+        return products
 
-    if not "product" in data:
-        return product
+    if orjson is not None:
+        # pylint reports a no-member false positive on orjson's
+        # compiled module
+        data = orjson.loads(text)  # pylint: disable=no-member
+    else:
+        data = json.loads(text)
 
-    if "title" in data["product"]:
-        product["title"] = data["product"]["title"]
+    infos = data.get("products") or []
 
-    if "images" in data["product"] and len(data["product"]["images"]) > 0:
-        if "src" in data["product"]["images"][0]:
-            product["image"] = data["product"]["images"][0]["src"]
+    return [_product_fields(info) for info in infos[:limit]]
 
-    return product
+
+def _product_fields(info: dict) -> dict:
+    """Pick title and featured image URL from one product dict
+
+    Parameters:
+        info (dict): Parsed shopify product dict
+
+    Returns:
+        dict: Dictionary containing product title and featured image URL
+
+    """
+    images = info.get("images") or [{}]
+
+    return {
+        "title": info.get("title"),
+        "image": images[0].get("src")
+    }
 
 
 def load_store_domains(path: str) -> List[str]:
@@ -201,118 +409,136 @@ def load_store_domains(path: str) -> List[str]:
     if not file_exists(path):
         raise FileNotFoundError("Input file does not exist")
 
-    domains: List[str] = []
+    with open(path, "r", newline="", buffering=1 << 20) as file:
+        reader = csv.reader(file)
 
-    with open(path, "r") as file:
-        reader = csv.DictReader(file)
+        header = next(reader, [])
 
-        if "url" not in reader.fieldnames:
+        if "url" not in header:
             raise ValueError("CSV does not contain 'url' column")
 
-        for row in reader:
-            domains.append(row["url"])
+        # Resolve the column index once; plain csv.reader skips the
+        # per-row dict that DictReader would allocate. Blank and short
+        # rows are skipped, as DictReader used to do
+        url_index = header.index("url")
 
-    return domains
+        return [row[url_index] for row in reader if len(row) > url_index]
 
 
-def find_store_contact(domain: str) -> dict:
-    """Scrape shopify domain contact pages for contact informations
+async def find_contact_urls(session: aiohttp.ClientSession,
+                            domain: str) -> List[str]:
+    """Find candidate contact page URLs for the specified domain
+
+    Shopify stores publish their pages in /sitemap_pages_1.xml; reading
+    it turns the blind probe of 4 fixed paths (most of them 404s) into
+    fetches of pages known to exist. Stores without that sitemap fall
+    back to the fixed path list.
 
     Parameters:
+        session (ClientSession): Shared HTTP session
         domain (str): Shopify store domain
 
     Returns:
-        dict: Dict with domain contact information (email, twitter link, facebook link)
+        List[str]: Home page URL plus about/contact page URLs
 
     """
-    pages = [
-        "/",
-        "/pages/about",
-        "/pages/about-us",
-        "/pages/contact",
-        "/pages/contact-us"
-    ]
+    urls = {f"https://{domain}/": None}
 
-    contact = {
-        "email": None,
-        "facebook": None,
-        "twitter": None
-    }
+    sitemap = await load_page(session, f"https://{domain}/sitemap_pages_1.xml")
 
-    for page in pages:
-        url = f"https://{domain}{page}"
+    if sitemap is not None:
+        for match in SITEMAP_LOC_PATTERN.finditer(sitemap):
+            urls[match.group(1).decode("utf-8", errors="replace")] = None
 
-        content = load_page(url)
+            if len(urls) > MAX_CONTACT_PAGES:
+                break
 
-        if content is None:
-            continue
+    if len(urls) < 2:
+        for page in CONTACT_PAGES:
+            urls[f"https://{domain}{page}"] = None
 
-        if contact["email"] is None:
-            contact["email"] = extract_email(content)
+    return list(urls)
 
-        if contact["twitter"] is None:
-            contact["twitter"] = extract_twitter_link(content)
 
-        if contact["facebook"] is None:
-            contact["facebook"] = extract_facebook_link(content)
+async def find_store_contact(session: aiohttp.ClientSession, domain: str) -> dict:
+    """Scrape shopify domain contact pages for contact informations
 
-        if None not in contact.values():
-            break
+    All candidate pages are fetched concurrently and remaining fetches
+    are cancelled as soon as every contact field is filled.
 
-    return contact
+    Parameters:
+        session (ClientSession): Shared HTTP session
+        domain (str): Shopify store domain
 
-#
-# def load_product_handles(domain: str, limit: int = 5) -> List[str]:
-#     """Find shopify product handles on specified domain
+    Returns:
+        dict: Dict with domain contact information (email, twitter link, facebook link)
 
-#     Parameters:
-#         domain (str): Shopify store domain
-#         limit (int): Max number of returned products
+    """
+    contact = {
+        "email": None,
+        "facebook": None,
+        "twitter": None
+    }
 
-#     Returns:
-#         List[str]: List of shopify product handles
+    loop = asyncio.get_running_loop()
 
-#     """
-#     url = f"https://{domain}/collections/all"
+    urls = await find_contact_urls(session, domain)
 
-#     content = load_page(url)
+    tasks = [
+        asyncio.create_task(load_page(session, url))
+        for url in urls
+    ]
 
-#     if content is None:
-#         raise ValueError(f"Product list '{url}' could not be loaded")
+    for task in asyncio.as_completed(tasks):
+        content = await task
 
-#     handles = extract_product_handles(content, limit)
+        if content is None:
+            continue
 
-#     return handles
+        # Extraction is CPU-bound; running it on the executor keeps the
+        # event loop free to service other domains' fetches meanwhile
+        await loop.run_in_executor(None, extract_contacts, content, contact)
 
+        if None not in contact.values():
+            break
+
+    for task in tasks:
+        if not task.done():
+            task.cancel()
 
-# def load_product_json(domain: str, handle: str) -> dict:
-#     """Download shopify product data in JSON format
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    return contact
 
-#     Parameters:
-#         domain (str): Shopify store domain
-#         handle (str): Shopify product handle
 
-#     Returns:
-#         dict: Dict of shopify product info
+async def load_products(session: aiohttp.ClientSession,
+                        domain: str, limit: int = 5) -> List[dict]:
+    """Download first <limit> shopify products on specified domain
 
-#     """
-#     url = f"https://{domain}/products/{handle}.json"
+    One GET to /products.json replaces the former collection-page fetch
+    plus one request per product handle.
 
-#     content = load_page(url)
+    Parameters:
+        session (ClientSession): Shared HTTP session
+        domain (str): Shopify store domain
+        limit (int): Max number of returned products
 
-#     if content is None:
-#         raise ValueError(f"Product JSON '{url}' could not be loaded")
+    Returns:
+        List[dict]: List of shopify products info
 
-#     product = parse_product(content)
+    """
+    url = f"https://{domain}/products.json?limit={limit}"
 
-#     return product
+    content = await load_page(session, url)
 
-#
-def load_product_json(domain: str)
+    if content is None:
+        raise ValueError(f"Products JSON '{url}' could not be loaded")
 
+    # JSON parsing is CPU-bound like the page extractors; keep it off
+    # the event loop as well
+    loop = asyncio.get_running_loop()
 
-request.get("https://{domain}/products.json")
-Print(response.csv())
+    return await loop.run_in_executor(None, parse_products, content, limit)
 
 
 def save_stores_to_csv(stores: List[dict], path: str) -> None:
@@ -329,21 +555,24 @@ def save_stores_to_csv(stores: List[dict], path: str) -> None:
     if len(stores) < 1:
         raise ValueError("Stores are empty")
 
-    fieldnames = stores[0].keys()
+    fieldnames = list(stores[0].keys())
 
-    with open(path, "w") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
+    with open(path, "w", newline="", buffering=1 << 20) as file:
+        writer = csv.writer(file)
 
-        writer.writeheader()
+        writer.writerow(fieldnames)
 
-        for store in stores:
-            writer.writerow(store)
+        # Project dicts to rows up front; writerows then runs the whole
+        # batch through one buffered writer without per-row dict lookups
+        writer.writerows(
+            [store.get(field) for field in fieldnames] for store in stores)
 
 
-def load_store(domain: str) -> dict:
+async def load_store(session: aiohttp.ClientSession, domain: str) -> dict:
     """Load shopify store information from domain
 
     Parameters:
+        session (ClientSession): Shared HTTP session
         domain (str): Shopify store domain
 
     Returns:
@@ -355,12 +584,12 @@ def load_store(domain: str) -> dict:
     }
 
     # 2. Find store contacts
-    contact = find_store_contact(domain)
+    contact = await find_store_contact(session, domain)
 
     store.update(contact)
 
-    # 3. Load 5 product handles
-    handles = load_product_handles(domain, 5)
+    # 3.-4. Load 5 products in one batch call
+    products = await load_products(session, domain, 5)
 
     for i in range(5):
         product = {
@@ -368,9 +597,8 @@ def load_store(domain: str) -> dict:
             "image": None
         }
 
-        if len(handles) > i:
-            # 4. Load product JSON data
-            product = load_product_json(domain, handles[i])
+        if len(products) > i:
+            product = products[i]
 
         store[f"title {i+1}"] = product["title"]
         store[f"image {i+1}"] = product["image"]
@@ -378,6 +606,58 @@ def load_store(domain: str) -> dict:
     return store
 
 
+async def scrape_store(session: aiohttp.ClientSession,
+                       semaphore: asyncio.Semaphore, domain: str) -> dict:
+    """Scrape one shopify store under the concurrency limit
+
+    Parameters:
+        session (ClientSession): Shared HTTP session
+        semaphore (Semaphore): Limit on concurrently scraped domains
+        domain (str): Shopify store domain
+
+    Returns:
+        dict: Dict of shopify store info, None if the store failed
+
+    """
+    async with semaphore:
+        try:
+            store = await load_store(session, domain)
+
+            print(f"Loading '{domain}' ... OK")
+
+            return store
+
+        except ValueError as ex:
+            logging.error(str(ex))
+            print(f"Loading '{domain}' ... KO")
+
+            return None
+
+
+async def scrape_stores(domains: List[str]) -> List[dict]:
+    """Scrape shopify store information for all domains
+
+    Domains are independent, so they are scraped concurrently under a
+    bounded semaphore. One HTTP session is shared across all domains so
+    the connection pool and DNS cache are reused for the whole run.
+
+    Parameters:
+        domains (List[str]): Shopify store domains
+
+    Returns:
+        List[dict]: List of shopify stores informations
+
+    """
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async with create_session() as session:
+        stores = await asyncio.gather(
+            *[scrape_store(session, semaphore, domain) for domain in domains]
+        )
+
+    return [store for store in stores if store is not None]
+
+
 def main() -> None:
     """Main function working according to the description in the README.md file
     """
@@ -388,29 +668,21 @@ def main() -> None:
     parser = init_argparse()
     args = parser.parse_args()
 
-    stores = []
-
     # 1. Load stores domains
     try:
         domains = load_store_domains(args.input)
 
+        # Aggregated lists often repeat domains; each duplicate would
+        # pay the full multi-page scrape again
+        domains = list(dict.fromkeys(domains))
+
         print(f"Found {len(domains)} store domains")
     except ValueError as ex:
         logging.error(str(ex))
         return
 
-    for domain in domains:
-        print(f"Loading '{domain}' ...", end=" ")
-
-        try:
-            store = load_store(domain)
-            stores.append(store)
-
-            print("OK")
-
-        except ValueError as ex:
-            logging.error(str(ex))
-            print("KO")
+    # 2.-4. Scrape all stores over one shared session
+    stores = asyncio.run(scrape_stores(domains))
 
     # 5. Save stores to CSV
     save_stores_to_csv(stores, args.output)